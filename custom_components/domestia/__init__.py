@@ -17,8 +17,10 @@ from .const import (
     CONF_SCAN_INTERVAL,
     DEFAULT_PORT,
     DEFAULT_SCAN_INTERVAL,
+    REASSERT_POLICY,
 )
-from .udp import _get_client, discover_domestia_devices
+from .profiler import async_register_profile_service
+from .udp import _get_client, _release_client, discover_domestia_devices
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,6 +29,7 @@ PLATFORMS: list[str] = ["switch", "light", "button", "cover"]
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     hass.data.setdefault(DOMAIN, {})
+    async_register_profile_service(hass)
     return True
 
 
@@ -34,6 +37,11 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     host = entry.data[CONF_HOST]
     port = entry.data.get(CONF_PORT, DEFAULT_PORT)
     scan_interval = entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+    reassert_platforms = {
+        platform
+        for platform, (conf_key, default) in REASSERT_POLICY.items()
+        if entry.options.get(conf_key, entry.data.get(conf_key, default))
+    }
 
     _LOGGER.info("Démarrage de la découverte matérielle Domestia sur %s...", host)
     discovered_devices = await hass.async_add_executor_job(
@@ -44,12 +52,19 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     client = _get_client(host=host, port=port, timeout=2.5)
     last_frame: bytes | None = None
 
+    async def _reassert() -> None:
+        sent = await hass.async_add_executor_job(client.reassert_desired, reassert_platforms)
+        if sent:
+            await coordinator.async_request_refresh()
+
     async def _update_method() -> bytes:
         nonlocal last_frame
         try:
             frame = await hass.async_add_executor_job(client.read_states)
             if frame:
                 last_frame = frame
+                if client.reboot_pending():
+                    hass.async_create_task(_reassert())
                 return frame
             if last_frame:
                 return last_frame
@@ -75,14 +90,20 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         "devices": discovered_devices,
     }
 
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
         data = hass.data[DOMAIN].pop(entry.entry_id, None)
         if data and "client" in data:
-            await hass.async_add_executor_job(data["client"].close)
+            await hass.async_add_executor_job(_release_client, data["client"])
     return unload_ok
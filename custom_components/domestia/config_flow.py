@@ -2,21 +2,34 @@
 
 import voluptuous as vol
 from homeassistant import config_entries
+from homeassistant.core import callback
 
 from .const import (
     DOMAIN,
     CONF_HOST,
     CONF_PORT,
     CONF_SCAN_INTERVAL,
+    CONF_REASSERT_SWITCH,
+    CONF_REASSERT_LIGHT,
+    CONF_REASSERT_COVER,
     DEFAULT_HOST,
     DEFAULT_PORT,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_REASSERT_SWITCH,
+    DEFAULT_REASSERT_LIGHT,
+    DEFAULT_REASSERT_COVER,
+    REASSERT_POLICY,
 )
 
 
 class DomestiaConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        return DomestiaOptionsFlow(config_entry)
+
     async def async_step_user(self, user_input=None):
         if user_input is None:
             schema = vol.Schema(
@@ -24,6 +37,9 @@ class DomestiaConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     vol.Required(CONF_HOST, default=DEFAULT_HOST): str,
                     vol.Required(CONF_PORT, default=DEFAULT_PORT): int,
                     vol.Required(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): int,
+                    vol.Required(CONF_REASSERT_SWITCH, default=DEFAULT_REASSERT_SWITCH): bool,
+                    vol.Required(CONF_REASSERT_LIGHT, default=DEFAULT_REASSERT_LIGHT): bool,
+                    vol.Required(CONF_REASSERT_COVER, default=DEFAULT_REASSERT_COVER): bool,
                 }
             )
             return self.async_show_form(step_id="user", data_schema=schema)
@@ -35,3 +51,22 @@ class DomestiaConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             title=f"Domestia ({user_input[CONF_HOST]})",
             data=user_input,
         )
+
+
+class DomestiaOptionsFlow(config_entries.OptionsFlow):
+    def __init__(self, config_entry) -> None:
+        self._entry = config_entry
+
+    async def async_step_init(self, user_input=None):
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        # Options > données initiales > valeur par défaut
+        current = {**self._entry.data, **self._entry.options}
+        schema = vol.Schema(
+            {
+                vol.Required(conf_key, default=current.get(conf_key, default)): bool
+                for conf_key, default in REASSERT_POLICY.values()
+            }
+        )
+        return self.async_show_form(step_id="init", data_schema=schema)
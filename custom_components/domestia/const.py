@@ -6,10 +6,31 @@ CONF_HOST = "host"
 CONF_PORT = "port"
 CONF_SCAN_INTERVAL = "scan_interval"
 
+# Ré-affirmation de l'état voulu après un redémarrage du contrôleur (par plateforme)
+CONF_REASSERT_SWITCH = "reassert_switch"
+CONF_REASSERT_LIGHT = "reassert_light"
+CONF_REASSERT_COVER = "reassert_cover"
+
 # Pas d'IP "perso" en défaut: chaque install est différente
 DEFAULT_HOST = ""
 DEFAULT_PORT = 52000
 DEFAULT_SCAN_INTERVAL = 5  # secondes
+DEFAULT_REASSERT_SWITCH = True
+DEFAULT_REASSERT_LIGHT = True
+DEFAULT_REASSERT_COVER = False  # relancer un moteur de volet sans prévenir est risqué
+
+# plateforme -> (clé de config, valeur par défaut)
+REASSERT_POLICY: dict[str, tuple[str, bool]] = {
+    "switch": (CONF_REASSERT_SWITCH, DEFAULT_REASSERT_SWITCH),
+    "light": (CONF_REASSERT_LIGHT, DEFAULT_REASSERT_LIGHT),
+    "cover": (CONF_REASSERT_COVER, DEFAULT_REASSERT_COVER),
+}
+
+# Service de profilage à la demande
+SERVICE_PROFILE = "profile"
+ATTR_DURATION = "duration"
+DEFAULT_PROFILE_DURATION = 30  # secondes
+MAX_PROFILE_DURATION = 600
 
 # Virtuelles 57..104 (scènes) - On les garde car ce ne sont pas des modules physiques découvrables
 VIRTUAL_BUTTONS: dict[int, str] = {i: f"Sortie {i}" for i in range(57, 105)}
@@ -13,7 +13,13 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
-from .udp import build_relay_payload, get_output_value, send_udp_command
+from .udp import (
+    PLATFORM_COVER,
+    build_relay_payload,
+    get_output_value,
+    record_desired_state,
+    send_udp_command,
+)
 
 POST_COMMAND_REFRESH_DELAY = 0.5
 
@@ -87,17 +93,20 @@ class DomestiaCover(CoordinatorEntity, CoverEntity):
     async def async_open_cover(self, **kwargs) -> None:
         payload = build_relay_payload(self._id, True)
         await self.hass.async_add_executor_job(send_udp_command, self._host, self._port, payload)
+        record_desired_state(self._host, self._port, self._id, PLATFORM_COVER, 1)
         await asyncio.sleep(POST_COMMAND_REFRESH_DELAY)
         await self.coordinator.async_request_refresh()
 
     async def async_close_cover(self, **kwargs) -> None:
         payload = build_relay_payload(self._id, False)
         await self.hass.async_add_executor_job(send_udp_command, self._host, self._port, payload)
+        record_desired_state(self._host, self._port, self._id, PLATFORM_COVER, 0)
         await asyncio.sleep(POST_COMMAND_REFRESH_DELAY)
         await self.coordinator.async_request_refresh()
 
     async def async_stop_cover(self, **kwargs) -> None:
         payload = build_relay_payload(self._id, True)
         await self.hass.async_add_executor_job(send_udp_command, self._host, self._port, payload)
+        record_desired_state(self._host, self._port, self._id, PLATFORM_COVER, None)
         await asyncio.sleep(POST_COMMAND_REFRESH_DELAY)
         await self.coordinator.async_request_refresh()
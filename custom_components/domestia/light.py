@@ -11,7 +11,13 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
-from .udp import build_dimmer_payload, get_output_value, send_udp_command
+from .udp import (
+    PLATFORM_LIGHT,
+    build_dimmer_payload,
+    get_output_value,
+    record_desired_state,
+    send_udp_command,
+)
 
 HOLD_SECONDS = 6.0  
 POST_COMMAND_REFRESH_DELAY = 0.35
@@ -94,6 +100,7 @@ class DomestiaDimmerLight(CoordinatorEntity, LightEntity):
         payload = build_dimmer_payload(self._id, level)
 
         await self.hass.async_add_executor_job(send_udp_command, self._host, self._port, payload)
+        record_desired_state(self._host, self._port, self._id, PLATFORM_LIGHT, level)
 
         self._optimistic_is_on = True
         self._optimistic_brightness = brightness
@@ -107,6 +114,7 @@ class DomestiaDimmerLight(CoordinatorEntity, LightEntity):
         payload = build_dimmer_payload(self._id, 0)
 
         await self.hass.async_add_executor_job(send_udp_command, self._host, self._port, payload)
+        record_desired_state(self._host, self._port, self._id, PLATFORM_LIGHT, 0)
 
         self._optimistic_is_on = False
         self._optimistic_brightness = 0
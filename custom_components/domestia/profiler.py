@@ -0,0 +1,282 @@
+"""Profilage à la demande des chemins critiques Domestia (service domestia.profile).
+
+Les sondes ne sont installées que pendant la fenêtre de capture puis retirées:
+hors profilage, aucun code supplémentaire ne s'exécute.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import marshal
+import sys
+import threading
+import time
+from typing import Any, Callable
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall
+
+from . import udp
+from .const import (
+    ATTR_DURATION,
+    DEFAULT_PROFILE_DURATION,
+    DOMAIN,
+    MAX_PROFILE_DURATION,
+    SERVICE_PROFILE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DURATION, default=DEFAULT_PROFILE_DURATION): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=MAX_PROFILE_DURATION)
+        ),
+    }
+)
+
+LOCK_WAIT = "lock wait"
+LOCK_HOLD = "lock hold"
+
+
+class _ProfileStats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # clé pstats -> [appels, cumulé, propre, max]
+        self.functions: dict[tuple[str, int, str], list[float]] = {}
+        self.labels: dict[tuple[str, int, str], str] = {}
+        # Déjà inclus dans le temps propre des fonctions appelantes: rapport texte seulement
+        self.locks: dict[str, list[float]] = {}
+
+    def _children(self) -> list[float]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def enter(self) -> None:
+        self._children().append(0.0)
+
+    def leave(self, key: tuple[str, int, str], elapsed: float) -> None:
+        stack = self._children()
+        child_time = stack.pop()
+        if stack:
+            stack[-1] += elapsed
+        self.add(key, elapsed, elapsed - child_time)
+
+    def add(self, key: tuple[str, int, str], cumulative: float, own: float) -> None:
+        with self._lock:
+            entry = self.functions.setdefault(key, [0, 0.0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += cumulative
+            entry[2] += own
+            entry[3] = max(entry[3], cumulative)
+
+    def add_lock(self, kind: str, elapsed: float) -> None:
+        with self._lock:
+            entry = self.locks.setdefault(kind, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += elapsed
+            entry[2] = max(entry[2], elapsed)
+
+
+class _TimedLock:
+    """Enveloppe du verrou client mesurant l'attente et la durée de détention."""
+
+    def __init__(self, lock: Any, stats: _ProfileStats) -> None:
+        self._lock = lock
+        self._stats = stats
+        self._acquired_at = 0.0
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        start = time.perf_counter()
+        acquired = self._lock.acquire(blocking, timeout)
+        if acquired:
+            self._acquired_at = time.perf_counter()
+            wait = self._acquired_at - start
+            self._stats.add_lock(LOCK_WAIT, wait)
+        return acquired
+
+    def release(self) -> None:
+        held = time.perf_counter() - self._acquired_at
+        self._lock.release()
+        self._stats.add_lock(LOCK_HOLD, held)
+
+    def locked(self) -> bool:
+        return self._lock.locked()
+
+    def __enter__(self) -> bool:
+        return self.acquire()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.release()
+
+
+# Classes d'entités prises dans sys.modules: pas d'import bloquant dans la boucle,
+# une plateforme pas encore chargée est simplement ignorée
+_ENTITY_HOT_PATHS: dict[tuple[str, str], tuple[str, ...]] = {
+    ("switch", "DomestiaRelaySwitch"): ("is_on",),
+    ("light", "DomestiaDimmerLight"): ("is_on", "brightness"),
+    ("cover", "DomestiaCover"): ("current_cover_position", "is_closed", "is_opening"),
+}
+
+
+def _hot_paths() -> list[tuple[Any, str]]:
+    paths: list[tuple[Any, str]] = [
+        (udp.DomestiaUDPClient, "read_states"),
+        (udp.DomestiaUDPClient, "send_only"),
+        (udp.DomestiaUDPClient, "_drain_push_frames"),
+        (udp.DomestiaUDPClient, "reassert_desired"),
+        (udp, "discover_domestia_devices"),
+    ]
+    package = sys.modules.get(__package__)
+    if package is not None:
+        paths.append((package, "discover_domestia_devices"))
+
+    for (platform, class_name), attrs in _ENTITY_HOT_PATHS.items():
+        module = sys.modules.get(f"{__package__}.{platform}")
+        entity_class = getattr(module, class_name, None)
+        if entity_class is None:
+            continue
+        paths.extend((entity_class, attr) for attr in attrs)
+    return paths
+
+
+def _instrument(func: Callable, stats: _ProfileStats) -> Callable:
+    code = func.__code__
+    key = (code.co_filename, code.co_firstlineno, code.co_name)
+    stats.labels[key] = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        stats.enter()
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            stats.leave(key, time.perf_counter() - start)
+
+    return wrapper
+
+
+class DomestiaProfiler:
+    def __init__(self) -> None:
+        self.stats = _ProfileStats()
+        self.started = 0.0
+        self.stopped = 0.0
+        self._originals: list[tuple[Any, str, Any]] = []
+        self._locks: list[tuple[udp.DomestiaUDPClient, Any]] = []
+
+    def start(self) -> None:
+        for owner, name in _hot_paths():
+            original = owner.__dict__.get(name)
+            if isinstance(original, property):
+                patched = property(_instrument(original.fget, self.stats))
+            elif callable(original):
+                patched = _instrument(original, self.stats)
+            else:
+                continue
+            setattr(owner, name, patched)
+            self._originals.append((owner, name, original))
+
+        with udp._CLIENTS_LOCK:
+            clients = list(udp._CLIENTS.values())
+        for client in clients:
+            lock = client._lock
+            client._lock = _TimedLock(lock, self.stats)
+            self._locks.append((client, lock))
+
+        self.started = time.perf_counter()
+
+    def stop(self) -> None:
+        self.stopped = time.perf_counter()
+        for owner, name, original in reversed(self._originals):
+            setattr(owner, name, original)
+        for client, lock in self._locks:
+            client._lock = lock
+        self._originals.clear()
+        self._locks.clear()
+
+    def write_report(self, base_path: str) -> tuple[str, str]:
+        with self.stats._lock:
+            functions = {key: list(entry) for key, entry in self.stats.functions.items()}
+            locks = {kind: list(entry) for kind, entry in self.stats.locks.items()}
+
+        # Format pstats (chargeable avec pstats.Stats / snakeviz)
+        pstats_path = f"{base_path}.pstats"
+        raw = {
+            key: (int(calls), int(calls), own, cumulative, {})
+            for key, (calls, cumulative, own, _) in functions.items()
+        }
+        with open(pstats_path, "wb") as file:
+            marshal.dump(raw, file)
+
+        labels = self.stats.labels
+        lines = [
+            f"Profil Domestia sur {self.stopped - self.started:.1f} s",
+            "",
+            f"{'fonction':<45}{'appels':>8}{'cumul ms':>12}{'propre ms':>12}"
+            f"{'moy ms':>10}{'max ms':>10}",
+        ]
+        for key, (calls, cumulative, own, longest) in sorted(
+            functions.items(), key=lambda item: item[1][1], reverse=True
+        ):
+            lines.append(
+                f"{labels.get(key, key[2]):<45}{int(calls):>8}{cumulative * 1000:>12.2f}"
+                f"{own * 1000:>12.2f}{cumulative * 1000 / calls:>10.3f}{longest * 1000:>10.3f}"
+            )
+
+        lines += [
+            "",
+            f"{'verrou DomestiaUDPClient':<45}{'nombre':>8}{'total ms':>12}{'moy ms':>12}{'max ms':>10}",
+        ]
+        for kind in (LOCK_WAIT, LOCK_HOLD):
+            if kind not in locks:
+                continue
+            count, total, longest = locks[kind]
+            lines.append(
+                f"{kind:<45}{int(count):>8}{total * 1000:>12.2f}"
+                f"{total * 1000 / count:>12.3f}{longest * 1000:>10.3f}"
+            )
+
+        report_path = f"{base_path}.txt"
+        with open(report_path, "w", encoding="utf-8") as file:
+            file.write("\n".join(lines) + "\n")
+        return report_path, pstats_path
+
+
+def async_register_profile_service(hass: HomeAssistant) -> None:
+    capture: asyncio.Task | None = None
+
+    async def _async_capture(duration: float) -> None:
+        profiler = DomestiaProfiler()
+        _LOGGER.info("Profilage Domestia démarré pour %.0f s", duration)
+        try:
+            # stop() restaure aussi une installation partielle des sondes
+            profiler.start()
+            await asyncio.sleep(duration)
+        finally:
+            profiler.stop()
+
+        base_path = hass.config.path(f"domestia_profile_{int(time.time())}")
+        report_path, pstats_path = await hass.async_add_executor_job(
+            profiler.write_report, base_path
+        )
+        _LOGGER.warning("Profil Domestia écrit dans %s et %s", report_path, pstats_path)
+
+    async def _async_profile(call: ServiceCall) -> None:
+        nonlocal capture
+        if capture is not None and not capture.done():
+            _LOGGER.warning("Profilage Domestia déjà en cours")
+            return
+
+        # L'appel rend la main tout de suite; la fin de capture est journalisée
+        capture = hass.async_create_background_task(
+            _async_capture(call.data[ATTR_DURATION]), f"{DOMAIN}_profile"
+        )
+
+    hass.services.async_register(DOMAIN, SERVICE_PROFILE, _async_profile, schema=PROFILE_SCHEMA)
@@ -11,7 +11,13 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
-from .udp import build_relay_payload, get_output_value, send_udp_command
+from .udp import (
+    PLATFORM_SWITCH,
+    build_relay_payload,
+    get_output_value,
+    record_desired_state,
+    send_udp_command,
+)
 
 HOLD_SECONDS = 6.0  
 POST_COMMAND_REFRESH_DELAY = 0.35
@@ -68,6 +74,7 @@ class DomestiaRelaySwitch(CoordinatorEntity, SwitchEntity):
     async def async_turn_on(self, **kwargs) -> None:
         payload = build_relay_payload(self._id, True)
         await self.hass.async_add_executor_job(send_udp_command, self._host, self._port, payload)
+        record_desired_state(self._host, self._port, self._id, PLATFORM_SWITCH, 1)
 
         self._optimistic_is_on = True
         self._hold_until = time.time() + HOLD_SECONDS
@@ -79,6 +86,7 @@ class DomestiaRelaySwitch(CoordinatorEntity, SwitchEntity):
     async def async_turn_off(self, **kwargs) -> None:
         payload = build_relay_payload(self._id, False)
         await self.hass.async_add_executor_job(send_udp_command, self._host, self._port, payload)
+        record_desired_state(self._host, self._port, self._id, PLATFORM_SWITCH, 0)
 
         self._optimistic_is_on = False
         self._hold_until = time.time() + HOLD_SECONDS
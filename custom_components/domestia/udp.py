@@ -16,6 +16,17 @@ READ_CMD = bytes([0xFF, 0x00, 0x00, 0x01, 0x9C, 0x9C])
 ATRRELAIS_HEADER_PREFIX = (0xFF, 0x00)
 ATRRELAIS_VALUES_OFFSET = 3
 MAX_OUTPUTS = 192
+HARDWARE_TYPES_REPLY = 0xC0
+
+# Détection de redémarrage du contrôleur + ré-affirmation de l'état voulu
+PLATFORM_SWITCH = "switch"
+PLATFORM_LIGHT = "light"
+PLATFORM_COVER = "cover"
+JOURNAL_SETTLE_SECONDS = 10.0  # délai avant de confronter une commande à la trame
+JOURNAL_MAX_AGE = 6 * 3600.0
+REASSERT_SEND_INTERVAL = 0.05
+REASSERT_MAX_BURST = 48
+REASSERT_COOLDOWN = 30.0
 
 
 def _checksum(payload_list: list[int]) -> int:
@@ -45,9 +56,38 @@ def _is_state_frame(data: bytes) -> bool:
         return False
     if (data[0], data[1]) != ATRRELAIS_HEADER_PREFIX:
         return False
+    # Même en-tête FF 00 que la table des types (0xC0): ce n'est pas une trame d'état
+    if _is_hardware_types_frame(data):
+        return False
     return True
 
 
+def _is_hardware_types_frame(data: bytes) -> bool:
+    return bool(data) and len(data) >= 196 and data[0] == 0xFF and data[3] == HARDWARE_TYPES_REPLY
+
+
+def _active_outputs(frame: bytes) -> int:
+    values = frame[ATRRELAIS_VALUES_OFFSET:ATRRELAIS_VALUES_OFFSET + MAX_OUTPUTS]
+    return sum(1 for v in values if v)
+
+
+def _desired_matches(platform: str, desired: int, actual: int) -> bool:
+    if platform == PLATFORM_LIGHT:
+        return desired == actual
+    if platform == PLATFORM_COVER:
+        # Volet en mouvement (bit 7): on ne le considère pas comme divergent
+        if actual >= 128:
+            return True
+        return (desired > 0) == ((actual % 128) > 0)
+    return (desired > 0) == (actual > 0)
+
+
+def _build_desired_payload(platform: str, output_id: int, value: int) -> bytes:
+    if platform == PLATFORM_LIGHT:
+        return build_dimmer_payload(output_id, value)
+    return build_relay_payload(output_id, value > 0)
+
+
 class DomestiaUDPClient:
     def __init__(self, host: str, port: int, timeout: float = 2.5) -> None:
         self._host = str(host)
@@ -62,6 +102,19 @@ class DomestiaUDPClient:
 
         self._last_state: Optional[bytes] = None
         self._last_state_ts: float = 0.0
+        # Lecture restée sans réponse juste avant la trame suivante
+        self._read_gap = False
+
+        # Journal de l'état voulu: output_id -> (plateforme, valeur, horodatage)
+        self._journal_lock = threading.Lock()
+        self._journal: dict[int, tuple[str, int, float]] = {}
+        self._reboot_detected = False
+        # Première trame reçue après la détection, seule base valable de comparaison
+        self._reboot_frame: Optional[bytes] = None
+        # Sorties déjà ré-envoyées pour le redémarrage en cours (salves successives)
+        self._reasserted: set[int] = set()
+        self._reassert_lock = threading.Lock()
+        self._last_reassert_ts: float = 0.0
 
     def close(self) -> None:
         with self._lock:
@@ -106,9 +159,136 @@ class DomestiaUDPClient:
             data = self._recv_one(timeout=0.01)
             if not data:
                 return
-            if _is_state_frame(data):
-                self._last_state = data
-                self._last_state_ts = time.time()
+            if _is_hardware_types_frame(data):
+                # Table des types renvoyée sans demande: le contrôleur vient de redémarrer
+                _LOGGER.warning("Table des types Domestia rechargée: redémarrage du contrôleur détecté")
+                self._flag_reboot()
+                # La trame en cache date d'avant le redémarrage
+                self._last_state_ts = 0.0
+            elif _is_state_frame(data):
+                self._store_state(data)
+
+    def _store_state(self, data: bytes) -> None:
+        read_gap = self._read_gap
+        self._last_state = data
+        self._last_state_ts = time.time()
+        self._read_gap = False
+
+        if _active_outputs(data) == 0 and self._journal_has_active_divergence(data):
+            # Sans coupure de communication, c'est une extinction générale (scène, bouton)
+            if read_gap:
+                _LOGGER.warning(
+                    "Toutes les sorties Domestia remises à zéro après une coupure: "
+                    "redémarrage du contrôleur détecté"
+                )
+                self._flag_reboot()
+            else:
+                _LOGGER.debug("Toutes les sorties Domestia à zéro sans coupure: extinction générale")
+
+        with self._journal_lock:
+            if self._reboot_detected:
+                self._reboot_frame = data
+                return
+        self._reconcile_journal(data)
+
+    def _journal_has_active_divergence(self, frame: bytes) -> bool:
+        with self._journal_lock:
+            return any(
+                value > 0 and not _desired_matches(platform, value, get_output_value(frame, output_id))
+                for output_id, (platform, value, _) in self._journal.items()
+            )
+
+    def _flag_reboot(self) -> None:
+        with self._journal_lock:
+            self._reboot_detected = True
+            self._reboot_frame = None
+            self._reasserted.clear()
+
+    def _reconcile_journal(self, frame: bytes) -> None:
+        # Une sortie changée ailleurs (bouton mural, scène) n'est plus "voulue" par HA
+        now = time.time()
+        with self._journal_lock:
+            for output_id, (platform, value, ts) in list(self._journal.items()):
+                age = now - ts
+                if age > JOURNAL_MAX_AGE:
+                    del self._journal[output_id]
+                elif age > JOURNAL_SETTLE_SECONDS and not _desired_matches(
+                    platform, value, get_output_value(frame, output_id)
+                ):
+                    del self._journal[output_id]
+
+    def record_desired(self, output_id: int, platform: str, value: Optional[int]) -> None:
+        with self._journal_lock:
+            if value is None:
+                self._journal.pop(int(output_id), None)
+            else:
+                self._journal[int(output_id)] = (platform, int(value), time.time())
+
+    def reboot_pending(self) -> bool:
+        with self._journal_lock:
+            return self._reboot_detected
+
+    def reassert_desired(self, platforms: set[str]) -> int:
+        # Un seul envoi groupé à la fois
+        if not self._reassert_lock.acquire(blocking=False):
+            return 0
+        try:
+            return self._reassert_desired(platforms)
+        finally:
+            self._reassert_lock.release()
+
+    def _reassert_desired(self, platforms: set[str]) -> int:
+        now = time.time()
+        with self._journal_lock:
+            frame = self._reboot_frame
+            if not self._reboot_detected or frame is None:
+                # Pas encore de trame postérieure au redémarrage: on reste en attente
+                return 0
+            if platforms and now - self._last_reassert_ts < REASSERT_COOLDOWN:
+                _LOGGER.debug("Ré-affirmation Domestia différée (délai minimal non écoulé)")
+                return 0
+
+            diverging = [
+                (output_id, platform, value)
+                for output_id, (platform, value, ts) in sorted(self._journal.items())
+                if platform in platforms
+                and output_id not in self._reasserted
+                and now - ts <= JOURNAL_MAX_AGE
+                and not _desired_matches(platform, value, get_output_value(frame, output_id))
+            ]
+            if len(diverging) > REASSERT_MAX_BURST:
+                # Le reste part dans une salve suivante, après REASSERT_COOLDOWN
+                _LOGGER.info(
+                    "%d sorties Domestia à ré-affirmer, %d dans cette salve",
+                    len(diverging),
+                    REASSERT_MAX_BURST,
+                )
+                diverging = diverging[:REASSERT_MAX_BURST]
+            else:
+                self._reboot_detected = False
+                self._reboot_frame = None
+                self._reasserted.clear()
+            for output_id, platform, value in diverging:
+                # Nouveau délai de stabilisation pour la commande ré-envoyée
+                self._journal[output_id] = (platform, value, now)
+                if self._reboot_detected:
+                    self._reasserted.add(output_id)
+
+        if not diverging:
+            return 0
+
+        self._last_reassert_ts = now
+        pending = [
+            _build_desired_payload(platform, output_id, value)
+            for output_id, platform, value in diverging
+        ]
+        for i, payload in enumerate(pending):
+            if i:
+                time.sleep(REASSERT_SEND_INTERVAL)
+            self.send_only(payload)
+
+        _LOGGER.info("%d sorties Domestia ré-affirmées après redémarrage", len(pending))
+        return len(pending)
 
     def read_states(self) -> Optional[bytes]:
         with self._lock:
@@ -120,15 +300,16 @@ class DomestiaUDPClient:
             try:
                 self._sock.sendto(READ_CMD, (self._host, self._port))
             except OSError:
+                self._read_gap = True
                 return self._last_state
 
             data = self._recv_one(timeout=self._timeout)
 
             if data and _is_state_frame(data):
-                self._last_state = data
-                self._last_state_ts = time.time()
+                self._store_state(data)
                 return data
 
+            self._read_gap = True
             self._drain_push_frames()
             return self._last_state
 
@@ -147,11 +328,27 @@ def _get_client(host: str, port: int, timeout: float = 2.5) -> DomestiaUDPClient
         return client
 
 
+def _release_client(client: DomestiaUDPClient) -> None:
+    # Retiré du cache avant fermeture: un rechargement repart d'un socket neuf
+    key = (client._host, client._port)
+    with _CLIENTS_LOCK:
+        if _CLIENTS.get(key) is client:
+            del _CLIENTS[key]
+    client.close()
+
+
 def send_udp_command(host: str, port: int, payload: bytes, timeout: float = 2.5) -> None:
     client = _get_client(host, port, timeout)
     client.send_only(payload)
 
 
+def record_desired_state(
+    host: str, port: int, output_id: int, platform: str, value: Optional[int], timeout: float = 2.5
+) -> None:
+    client = _get_client(host, port, timeout)
+    client.record_desired(output_id, platform, value)
+
+
 def get_output_value(frame: bytes, output_id: int) -> int:
     if not frame:
         return 0
@@ -177,7 +374,7 @@ def _get_hardware_types(host: str, port: int) -> list[int] | None:
         payload.append(_checksum(payload))
         sock.sendto(bytes(payload), (host, port))
         data, _ = sock.recvfrom(1024)
-        if data and len(data) >= 196 and data[0] == 0xFF and data[3] == 0xC0:
+        if _is_hardware_types_frame(data):
             return list(data[4:4 + 192])
     except Exception:
         pass